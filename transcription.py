@@ -4,7 +4,7 @@ Outil de transcription pour fichiers audio très longs (optimisé pour 13+ heure
 Compatible avec macOS Apple Silicon et autres plateformes
 
 Utilise le modèle Whisper d'OpenAI (https://github.com/openai/whisper) en mode local
-ou via les API d'OpenAI ou AssemblyAI pour la transcription.
+via faster-whisper (https://github.com/SYSTRAN/faster-whisper) ou via les API d'OpenAI ou AssemblyAI pour la transcription.
 
 Approche de Whisper:
 ![Approche Whisper](https://raw.githubusercontent.com/openai/whisper/main/approach.png)
@@ -20,8 +20,18 @@ import json
 import time
 import tempfile
 import shutil
+import math
+import bisect
+import re
+import ssl
+import unicodedata
+import queue
+import threading
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import accumulate, islice
 
 # Configuration - À modifier selon vos besoins
 CONFIG = {
@@ -29,15 +39,27 @@ CONFIG = {
     "output_folder": "transcriptions",  # Dossier pour les sorties
     "temp_folder": "temp_audio",  # Dossier temporaire
     "whisper_model": "tiny",  # Options: tiny, base, small, medium, large
-    "parallel_jobs": 1,       # Nombre de transcriptions en parallèle (1 pour fiabilité)
+    "batch_size": 16,         # Nombre de fenêtres de 30 s décodées ensemble (mode local)
+    "compute_type": "auto",   # Options: auto, int8, int8_float16, float16, float32 (mode local)
+    "parallel_jobs": 1,       # Nombre de tâches en parallèle, découpage FFmpeg compris (1 pour fiabilité)
     "api_service": "local",   # Options: local (modèle Whisper open source), assemblyai, openai
     "speaker_diarization": False,  # Identification des différents locuteurs
     "min_speakers": 1,        # Nombre minimum de locuteurs à identifier
     "max_speakers": 2,        # Nombre maximum de locuteurs à identifier
-    "hg_models_dir": "hg-models"  # Dossier pour stocker les modèles HuggingFace localement
+    "hg_models_dir": "hg-models",  # Dossier pour stocker les modèles HuggingFace localement
+    "ssl_fix": True           # Corriger les certificats SSL macOS à la première erreur
 }
 
 # Constantes
+SAMPLE_RATE = 16000  # Fréquence d'échantillonnage attendue par Whisper (Hz)
+VAD_BOUNDARY_WINDOW = 30  # Secondes analysées par la VAD pour placer chaque coupe
+MAX_RETRY_AFTER = 60  # Attente maximale (s) acceptée depuis un en-tête Retry-After
+
+# Expressions régulières de sanitize_filename, compilées une seule fois
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s.-]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
 WHISPER_MODELS = {
     "tiny": {"ram": "1GB", "speed": "très rapide", "qualité": "basique"},
     "base": {"ram": "1GB", "speed": "rapide", "qualité": "acceptable"},
@@ -57,7 +79,7 @@ def identify_speakers(audio_file, text, segments):
     Identifie les différents locuteurs dans un fichier audio
     
     Args:
-        audio_file: Chemin vers le fichier audio
+        audio_file: Chemin vers le fichier audio ou échantillons mono à 16 kHz
         text: Texte transcrit
         segments: Segments de la transcription avec timestamps
     
@@ -71,6 +93,13 @@ def identify_speakers(audio_file, text, segments):
         raise ImportError("La bibliothèque pyannote.audio est requise pour l'identification des locuteurs. "
                          "Installez-la avec: pip install pyannote.audio")
     
+    # pyannote accepte aussi une forme d'onde déjà chargée en mémoire
+    if not isinstance(audio_file, str):
+        audio_file = {
+            "waveform": torch.from_numpy(audio_file).unsqueeze(0),
+            "sample_rate": SAMPLE_RATE
+        }
+    
     # Créer le dossier pour les modèles HuggingFace s'il n'existe pas
     os.makedirs(CONFIG["hg_models_dir"], exist_ok=True)
     
@@ -79,10 +108,10 @@ def identify_speakers(audio_file, text, segments):
     local_model_path = os.path.join(CONFIG["hg_models_dir"], "speaker-diarization-3.0")
     
     # Vérifier si le modèle existe localement
-    if os.path.exists(local_model_path) and os.path.isdir(local_model_path):
+    if os.path.isdir(local_model_path):
         print(f"🔄 Chargement du modèle local d'identification des locuteurs depuis {local_model_path}...")
         try:
-            pipeline = Pipeline.from_pretrained(local_model_path)
+            pipeline = _with_ssl_fix(Pipeline.from_pretrained, local_model_path)
             print("✅ Modèle local chargé avec succès.")
         except Exception as e:
             print(f"⚠️ Erreur lors du chargement du modèle local: {e}")
@@ -102,7 +131,8 @@ def identify_speakers(audio_file, text, segments):
         # Télécharger et sauvegarder le modèle localement
         print(f"🔄 Téléchargement du modèle d'identification des locuteurs vers {local_model_path}...")
         try:
-            pipeline = Pipeline.from_pretrained(
+            pipeline = _with_ssl_fix(
+                Pipeline.from_pretrained,
                 model_id,
                 use_auth_token=hf_token,
                 cache_dir=CONFIG["hg_models_dir"]
@@ -171,18 +201,20 @@ def check_dependencies():
     """Vérifie que toutes les dépendances nécessaires sont installées"""
     missing = []
     
-    # Vérifier FFmpeg
-    try:
-        subprocess.run(["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-    except (subprocess.SubprocessError, FileNotFoundError):
-        missing.append("FFmpeg")
+    # Vérifier FFmpeg et ffprobe (fourni avec FFmpeg, utilisé pour la durée des fichiers)
+    for tool in ("ffmpeg", "ffprobe"):
+        try:
+            subprocess.run([tool, "-version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            if "FFmpeg" not in missing:
+                missing.append("FFmpeg")
     
-    # Vérifier Whisper si mode local
+    # Vérifier faster-whisper si mode local
     if CONFIG["api_service"] == "local":
         try:
-            import whisper
+            import faster_whisper
         except ImportError:
-            missing.append("OpenAI Whisper")
+            missing.append("faster-whisper")
     
     # Vérifier pyannote.audio si diarization activée
     if CONFIG["speaker_diarization"]:
@@ -200,12 +232,11 @@ def check_dependencies():
         print("⚠️ Dépendances manquantes:")
         for dep in missing:
             if dep == "FFmpeg":
-                print("  - FFmpeg: installez avec 'brew install ffmpeg' sur macOS")
+                print("  - FFmpeg (ffmpeg et ffprobe): installez avec 'brew install ffmpeg' sur macOS")
                 print("            ou 'apt install ffmpeg' sur Ubuntu/Debian")
-            elif dep == "OpenAI Whisper":
-                print("  - OpenAI Whisper: installez avec 'pip install -U openai-whisper'")
-                print("    Note: Assurez-vous d'avoir Pytorch installé")
-                print("    Repo GitHub: https://github.com/openai/whisper")
+            elif dep == "faster-whisper":
+                print("  - faster-whisper: installez avec 'pip install -U faster-whisper'")
+                print("    Repo GitHub: https://github.com/SYSTRAN/faster-whisper")
             elif dep == "pyannote.audio":
                 print("  - pyannote.audio: installez avec 'pip install pyannote.audio'")
                 print("    Note: Nécessite un token HuggingFace (https://huggingface.co/)")
@@ -213,46 +244,39 @@ def check_dependencies():
                 
         print("\nInstallation recommandée sur macOS:")
         print("  brew install ffmpeg")
-        print("  pip install -U openai-whisper torch")
+        print("  pip install -U faster-whisper")
         if "pyannote.audio" in missing:
             print("  pip install pyannote.audio")
         
         return False
     
-    # Vérifier si le répertoire temporaire existe déjà
-    if os.path.exists(CONFIG["temp_folder"]):
-        print(f"⚠️ Le dossier temporaire {CONFIG['temp_folder']} existe déjà.")
-        print("   Il contient peut-être des fichiers d'une exécution précédente.")
-        try:
-            # Essayer de nettoyer les fichiers wav
-            for file in os.listdir(CONFIG["temp_folder"]):
-                if file.endswith(".wav"):
-                    os.remove(os.path.join(CONFIG["temp_folder"], file))
-            print("✅ Nettoyage des fichiers temporaires effectué.")
-        except Exception as e:
-            print(f"⚠️ Impossible de nettoyer certains fichiers: {e}")
-            print("   Vous pouvez essayer de supprimer manuellement ce dossier.")
+    # Supprimer le répertoire temporaire s'il existe déjà: il ne peut contenir
+    # que des fichiers d'une exécution précédente
+    try:
+        shutil.rmtree(CONFIG["temp_folder"])
+        print(f"⚠️ Le dossier temporaire {CONFIG['temp_folder']} existait déjà (exécution précédente).")
+        print("✅ Nettoyage des fichiers temporaires effectué.")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"⚠️ Impossible de nettoyer le dossier temporaire {CONFIG['temp_folder']}: {e}")
+        print("   Vous pouvez essayer de supprimer manuellement ce dossier.")
     
     return True
 
 def get_audio_duration(audio_file):
-    """Obtient la durée d'un fichier audio en secondes en utilisant FFmpeg"""
+    """Obtient la durée d'un fichier audio en secondes en utilisant ffprobe"""
     try:
-        # Essayer d'échapper le chemin du fichier pour gérer les espaces et caractères spéciaux
-        cmd = ["ffmpeg", "-i", audio_file, "-f", "null", "-"]
-        result = subprocess.run(cmd, stderr=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding='utf-8', errors='replace')
-        
-        # Extraire la durée du résultat
-        import re
-        duration_match = re.search(r"Duration: (\d{2}):(\d{2}):(\d{2})\.(\d{2})", result.stderr)
-        
-        if not duration_match:
-            raise ValueError("Impossible de déterminer la durée du fichier audio")
-        
-        hours, minutes, seconds, centiseconds = map(int, duration_match.groups())
-        total_seconds = hours * 3600 + minutes * 60 + seconds + centiseconds / 100
+        # ffprobe ne lit que les métadonnées du conteneur, sans décoder l'audio
+        cmd = [
+            "ffprobe", "-v", "error",
+            "-show_entries", "format=duration",
+            "-of", "json",
+            audio_file
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace', check=True)
         
-        return total_seconds
+        return float(json.loads(result.stdout)["format"]["duration"])
     except Exception as e:
         print(f"⚠️ Erreur lors de la détermination de la durée: {e}")
         # En cas d'erreur, retourner une durée par défaut (1 heure)
@@ -266,120 +290,345 @@ def format_time(seconds):
     secs = int(seconds % 60)
     return f"{hours:02d}:{minutes:02d}:{secs:02d}"
 
-def split_audio(audio_file, chunk_duration_min=10, temp_folder="temp_audio"):
+def split_audio(audio_file, chunk_duration_min=10, temp_folder="temp_audio", total_duration=None):
     """
     Divise un fichier audio en segments de durée spécifiée
     
+    Les segments sont renvoyés au fur et à mesure de leur écriture par
+    FFmpeg, ce qui permet de transcrire les premiers pendant que les
+    suivants sont encore en préparation.
+    
     Args:
         audio_file: Chemin vers le fichier audio
         chunk_duration_min: Durée de chaque segment en minutes
         temp_folder: Dossier pour les fichiers temporaires
+        total_duration: Durée du fichier en secondes (déterminée si absente)
     
-    Returns:
-        Liste des chemins vers les segments audio
+    Yields:
+        Chemins vers les segments audio, dans l'ordre
     """
     # Créer le dossier temporaire s'il n'existe pas
     os.makedirs(temp_folder, exist_ok=True)
     
     # Obtenir la durée totale du fichier
-    total_duration = get_audio_duration(audio_file)
-    total_duration_formatted = format_time(total_duration)
-    print(f"📊 Durée totale du fichier: {total_duration_formatted} ({total_duration:.1f} secondes)")
+    if total_duration is None:
+        total_duration = get_audio_duration(audio_file)
     
-    # Calculer le nombre de segments
+    # Calculer le nombre de segments attendus
     chunk_duration_sec = chunk_duration_min * 60
-    num_chunks = int(total_duration / chunk_duration_sec) + 1
-    
-    # Préparer la liste pour stocker les chemins des segments
-    chunk_files = []
-    
-    # Extraire les segments
-    for i in range(num_chunks):
-        start_time = i * chunk_duration_sec
-        
-        # Si c'est le dernier segment, ajuster la durée
-        if i == num_chunks - 1:
-            duration = total_duration - start_time
-        else:
-            duration = chunk_duration_sec
-        
-        # Formater les temps pour FFmpeg
-        start_time_fmt = format_time(start_time)
-        duration_fmt = format_time(duration)
-        
-        # Préparer le nom du fichier de sortie - utiliser un nom simple sans caractères spéciaux
-        output_filename = os.path.join(
-            temp_folder, 
-            f"segment_{i:04d}_{start_time_fmt.replace(':', '-')}.wav"
-        )
-        
-        # Extraire le segment avec FFmpeg
+    num_chunks = max(1, math.ceil(total_duration / chunk_duration_sec))
+    
+    # Répartir les segments entre plusieurs processus FFmpeg (un par plage
+    # contiguë de segments), dans la limite de parallel_jobs et des cœurs disponibles
+    num_jobs = max(1, min(CONFIG["parallel_jobs"], os.cpu_count() or 1, num_chunks))
+    chunks_per_job = math.ceil(num_chunks / num_jobs)
+    
+    # Chaque processus décode sa plage une seule fois et la découpe avec le
+    # muxer "segment" de FFmpeg, en numérotant les fichiers à la suite.
+    # La dernière plage n'a pas de durée limite: elle va jusqu'à la fin réelle
+    # du fichier, même si la durée estimée est fausse.
+    # stderr reste affiché: avec -loglevel error, il ne contient que les erreurs
+    processes = []
+    first_chunks = range(0, num_chunks, chunks_per_job)
+    for first_chunk in first_chunks:
         cmd = [
             "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
-            "-ss", start_time_fmt, 
-            "-i", audio_file, 
-            "-t", duration_fmt,
+            "-ss", str(first_chunk * chunk_duration_sec),
+            "-i", audio_file
+        ]
+        if first_chunk != first_chunks[-1]:
+            cmd += ["-t", str(chunks_per_job * chunk_duration_sec)]
+        cmd += [
+            "-f", "segment",
+            "-segment_time", str(chunk_duration_sec),
+            "-segment_start_number", str(first_chunk),
+            "-reset_timestamps", "1",
             "-ac", "1",  # Mono pour une meilleure reconnaissance
-            "-ar", "16000",  # Fréquence d'échantillonnage de 16kHz
-            output_filename
+            "-ar", str(SAMPLE_RATE),  # Fréquence d'échantillonnage de 16kHz
+            "-c:a", "pcm_s16le",
+            os.path.join(temp_folder, "segment_%04d.wav")
         ]
-        
-        # Afficher la progression
-        progress = (i / num_chunks) * 100
-        print(f"⏳ Préparation du segment {i+1}/{num_chunks} ({progress:.1f}%) - {start_time_fmt} à {format_time(start_time + duration)}")
-        
-        # Exécuter la commande FFmpeg
-        subprocess.run(cmd, check=True)
-        
-        # Ajouter le chemin du fichier à la liste
-        chunk_files.append(output_filename)
+        processes.append(subprocess.Popen(cmd, stdout=subprocess.DEVNULL))
     
-    print(f"✅ Fichier audio divisé en {len(chunk_files)} segments")
-    return chunk_files
+    print(f"⏳ Préparation d'environ {num_chunks} segments de {format_time(chunk_duration_sec)} ({len(processes)} processus FFmpeg)...")
+    
+    try:
+        num_ready = 0
+        i = 0
+        while True:
+            # Les segments au-delà de l'estimation viennent du dernier processus
+            job = min(i // chunks_per_job, len(processes) - 1)
+            process = processes[job]
+            in_last_job = job == len(processes) - 1
+            last_of_range = not in_last_job and (i + 1) % chunks_per_job == 0
+            segment_file = os.path.join(temp_folder, f"segment_{i:04d}.wav")
+            next_file = os.path.join(temp_folder, f"segment_{i + 1:04d}.wav")
+            
+            # Le muxer ne crée le fichier suivant qu'après avoir fermé le courant:
+            # le segment est complet dès que le suivant existe ou que FFmpeg a terminé
+            while process.poll() is None and (last_of_range or not os.path.exists(next_file)):
+                time.sleep(0.2)
+            
+            if process.returncode:
+                raise subprocess.CalledProcessError(process.returncode, process.args)
+            
+            if os.path.exists(segment_file):
+                num_ready += 1
+                yield segment_file
+            elif in_last_job:
+                # Le dernier processus a terminé: aucun autre segment à venir
+                break
+            
+            i += 1
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+    
+    print(f"✅ Fichier audio divisé en {num_ready} segments")
 
-def transcribe_segment_local(audio_file, language="fr"):
+def _find_silence_cut(audio, window_sec=VAD_BOUNDARY_WINDOW):
     """
-    Transcrit un segment audio en utilisant le modèle Whisper open source d'OpenAI localement
-    https://github.com/openai/whisper
+    Cherche où couper un segment sans interrompre la parole
+    
+    La VAD Silero fournie avec faster-whisper est appliquée aux dernières
+    secondes du segment. Si la parole se poursuit jusqu'à la fin, la coupe
+    est avancée au silence qui précède le dernier passage parlé.
     
     Args:
-        audio_file: Chemin vers le fichier audio à transcrire
+        audio: Échantillons mono à 16 kHz du segment
+        window_sec: Durée analysée en fin de segment, en secondes
+    
+    Returns:
+        Index de l'échantillon auquel couper le segment
+    """
+    from faster_whisper.vad import get_speech_timestamps
+    
+    tail_start = max(0, len(audio) - window_sec * SAMPLE_RATE)
+    speech = get_speech_timestamps(audio[tail_start:])
+    
+    # Silence en fin de segment: la coupe fixe convient
+    if not speech or speech[-1]["end"] < len(audio) - tail_start:
+        return len(audio)
+    
+    # Parole sur toute la fenêtre: aucun silence exploitable
+    if speech[-1]["start"] == 0:
+        return len(audio)
+    
+    return tail_start + speech[-1]["start"]
+
+def stream_audio(audio_file, chunk_duration_min=10):
+    """
+    Décode un fichier audio en PCM mono 16 kHz et le découpe à la volée
+    
+    Les échantillons sont lus directement sur la sortie standard de FFmpeg,
+    sans écrire de fichiers temporaires sur le disque. Chaque coupe est
+    placée dans un silence proche de la durée demandée (voir
+    _find_silence_cut) pour éviter de couper un mot entre deux segments.
+    
+    Args:
+        audio_file: Chemin vers le fichier audio
+        chunk_duration_min: Durée approximative de chaque segment en minutes
+    
+    Yields:
+        Tuples (nom du segment, échantillons float32 compris entre -1 et 1)
+    """
+    import numpy as np
+    
+    chunk_duration_sec = chunk_duration_min * 60
+    chunk_bytes = chunk_duration_sec * SAMPLE_RATE * 2  # PCM 16 bits
+    
+    cmd = [
+        "ffmpeg", "-hide_banner", "-loglevel", "error",
+        "-i", audio_file,
+        "-f", "s16le",
+        "-ac", "1",  # Mono pour une meilleure reconnaissance
+        "-ar", str(SAMPLE_RATE),
+        "-"
+    ]
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    end_of_stream = False
+    
+    try:
+        i = 0
+        offset = 0  # Position du segment courant, en échantillons
+        carry = np.zeros(0, dtype=np.float32)  # Fin reportée du segment précédent
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            end_of_stream = len(data) < chunk_bytes
+            
+            # Ignorer un éventuel octet isolé en fin de flux
+            data = data[:len(data) - len(data) % 2]
+            audio = np.frombuffer(data, np.int16).astype(np.float32) / 32768.0
+            if carry.size:
+                audio = np.concatenate((carry, audio))
+            if not audio.size:
+                break
+            
+            cut = len(audio) if end_of_stream else _find_silence_cut(audio)
+            carry = audio[cut:]
+            
+            start_time_fmt = format_time(offset / SAMPLE_RATE)
+            yield f"segment_{i:04d}_{start_time_fmt.replace(':', '-')}", audio[:cut]
+            i += 1
+            offset += cut
+            
+            if end_of_stream:
+                break
+    finally:
+        # Arrêt anticipé (erreur ou interruption côté consommateur): tuer FFmpeg
+        # plutôt que de le laisser écrire dans un tube fermé
+        if not end_of_stream:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+    
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+# Modèles déjà chargés, indexés par nom, pour ne pas les recharger à chaque segment
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()  # Évite deux chargements simultanés (voir _warm_up_model)
+
+def _select_device():
+    """
+    Choisit le périphérique et le type de calcul pour CTranslate2
+    
+    Le type de calcul de CONFIG["compute_type"] est utilisé s'il est précisé
+    et pris en charge par le périphérique; sinon, un type quantifié adapté
+    au périphérique est choisi.
+    
+    Returns:
+        Tuple (périphérique, type de calcul)
+    """
+    import ctranslate2
+    
+    device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    
+    compute_type = CONFIG["compute_type"]
+    if compute_type != "auto" and compute_type not in ctranslate2.get_supported_compute_types(device):
+        # Ex: float16 n'est pas disponible sur CPU, Apple Silicon compris
+        print(f"⚠️ Type de calcul {compute_type} non pris en charge sur {device}, "
+              "utilisation du type automatique")
+        compute_type = "auto"
+    
+    if compute_type == "auto":
+        if device == "cuda":
+            # Poids int8, activations fp16 sur GPU NVIDIA
+            compute_type = "int8_float16"
+        else:
+            # CPU, y compris Apple Silicon (CTranslate2 n'utilise pas Metal): int8 pur
+            compute_type = "int8"
+    
+    return device, compute_type
+
+def _get_model(name):
+    """Renvoie le pipeline faster-whisper du modèle demandé, chargé une seule fois"""
+    with _MODEL_LOCK:
+        if name not in _MODEL_CACHE:
+            from faster_whisper import WhisperModel, BatchedInferencePipeline
+            
+            device, compute_type = _select_device()
+            print(f"🔄 Chargement du modèle Whisper ({name}) via faster-whisper ({device}, {compute_type})...")
+            # Le premier chargement télécharge le modèle depuis HuggingFace
+            model = _with_ssl_fix(WhisperModel, name, device=device, compute_type=compute_type)
+            _MODEL_CACHE[name] = BatchedInferencePipeline(model=model)
+        return _MODEL_CACHE[name]
+
+def _warm_up_model(name, language="fr"):
+    """
+    Charge le modèle local et exécute une courte inférence à blanc
+    
+    Lancée dans un thread au démarrage, pour que le modèle soit prêt quand
+    le premier segment est décodé. En cas d'échec, l'erreur sera signalée
+    lors du chargement normal du modèle.
+    """
+    try:
+        import numpy as np
+        
+        batched = _get_model(name)
+        segments, _ = batched.model.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32), language=language)
+        list(segments)
+    except Exception:
+        pass
+
+def transcribe_segment_local(audio, language="fr"):
+    """
+    Transcrit un segment audio localement avec faster-whisper (réimplémentation
+    CTranslate2 du modèle Whisper d'OpenAI, https://github.com/SYSTRAN/faster-whisper)
+    
+    Args:
+        audio: Chemin vers le fichier audio ou échantillons mono à 16 kHz
         language: Code de langue (ex: fr, en)
     
     Returns:
         Texte transcrit ou dictionnaire avec texte et informations sur les locuteurs
     """
-    import whisper
+    return transcribe_segments_local([audio], language)[0]
+
+def transcribe_segments_local(audios, language="fr"):
+    """
+    Transcrit localement plusieurs segments consécutifs en un seul passage
     
-    print(f"🔄 Chargement du modèle Whisper open source ({CONFIG['whisper_model']})...")
-    model = whisper.load_model(CONFIG['whisper_model'])
+    Les sous-segments détectés par la VAD sont décodés par lots. En concaténant
+    les segments, ces lots restent pleins d'un segment à l'autre: seul le
+    dernier lot de l'ensemble est incomplet.
     
-    print(f"🔄 Transcription en cours: {os.path.basename(audio_file)}")
-    result = model.transcribe(
-        audio_file, 
+    Args:
+        audios: Liste d'échantillons mono à 16 kHz (segments consécutifs),
+                ou liste contenant un seul chemin de fichier audio
+        language: Code de langue (ex: fr, en)
+    
+    Returns:
+        Liste des textes transcrits, un par segment
+    """
+    batched = _get_model(CONFIG['whisper_model'])
+    
+    if len(audios) == 1:
+        audio = audios[0]
+        offsets = [0.0]
+    else:
+        import numpy as np
+        audio = np.concatenate(audios)
+        # Début de chaque segment (en secondes) dans l'audio concaténé
+        offsets = [0.0] + list(accumulate(len(a) / SAMPLE_RATE for a in audios[:-1]))
+    
+    print("🔄 Transcription en cours...")
+    results, _ = batched.transcribe(
+        audio,
         language=language,
-        fp16=False  # Désactiver fp16 pour éviter les problèmes sur certains macOS
+        batch_size=CONFIG["batch_size"],
+        vad_filter=True
     )
     
-    # S'assurer que le texte est correctement encodé
-    text = result["text"]
-    if isinstance(text, bytes):
-        try:
-            text = text.decode('utf-8')
-        except UnicodeDecodeError:
-            text = text.decode('latin-1')
+    # Le résultat est un générateur: la transcription a lieu pendant l'itération.
+    # Chaque sous-segment est rattaché au segment dans lequel il commence.
+    segments_per_audio = [[] for _ in audios]
+    for result in results:
+        k = bisect.bisect_right(offsets, result.start) - 1
+        segments_per_audio[k].append({
+            "start": result.start - offsets[k],
+            "end": result.end - offsets[k],
+            "text": result.text
+        })
     
-    # Si l'identification des locuteurs est activée, utiliser pyannote.audio
-    if CONFIG["speaker_diarization"]:
-        try:
-            print("🔍 Identification des locuteurs en cours...")
-            speakers_text = identify_speakers(audio_file, text, result.get("segments", []))
-            return speakers_text
-        except Exception as e:
-            print(f"⚠️ Erreur lors de l'identification des locuteurs: {e}")
-            print("⚠️ Retour à la transcription simple sans identification des locuteurs")
+    texts = []
+    for audio, segments in zip(audios, segments_per_audio):
+        text = "".join(segment["text"] for segment in segments)
+        
+        # Si l'identification des locuteurs est activée, utiliser pyannote.audio
+        if CONFIG["speaker_diarization"]:
+            try:
+                print("🔍 Identification des locuteurs en cours...")
+                text = identify_speakers(audio, text, segments)
+            except Exception as e:
+                print(f"⚠️ Erreur lors de l'identification des locuteurs: {e}")
+                print("⚠️ Retour à la transcription simple sans identification des locuteurs")
+        
+        texts.append(text)
     
-    return text
+    return texts
 
 def transcribe_segment_assemblyai(audio_file, language="fr"):
     """
@@ -434,11 +683,33 @@ def transcribe_segment_assemblyai(audio_file, language="fr"):
     
     transcript_id = transcript_response.json()["id"]
     
-    # Attendre la transcription
-    print("⏳ Attente de la transcription...")
+    # Attendre la transcription, en espaçant progressivement les vérifications
+    # (de 0,25 s à 5 s) sauf si le serveur indique un délai via Retry-After
+    print(f"⏳ Attente de la transcription: {os.path.basename(audio_file)}")
+    delay = 0.25
     while True:
         transcript_status_url = f"https://api.assemblyai.com/v2/transcript/{transcript_id}"
-        transcript_status = requests.get(transcript_status_url, headers=headers).json()
+        status_response = requests.get(transcript_status_url, headers=headers)
+        
+        try:
+            # Borner la valeur du serveur: time.sleep refuse un délai négatif
+            wait = max(0.0, min(float(status_response.headers.get("Retry-After", delay)), MAX_RETRY_AFTER))
+        except ValueError:
+            # Retry-After au format date HTTP: garder le délai calculé
+            wait = delay
+        
+        # Limitation de débit ou erreur temporaire du serveur: réessayer plus tard
+        if status_response.status_code == 429 or status_response.status_code >= 500:
+            print(f"⚠️ Service indisponible ({status_response.status_code}), nouvelle tentative dans {wait:.1f} s")
+            time.sleep(wait)
+            delay = min(delay * 2, 5)
+            continue
+        
+        if status_response.status_code != 200:
+            print(f"❌ Erreur lors du suivi de la transcription: {status_response.text}")
+            return ""
+        
+        transcript_status = status_response.json()
         
         if transcript_status["status"] == "completed":
             print("✅ Transcription terminée!")
@@ -447,8 +718,8 @@ def transcribe_segment_assemblyai(audio_file, language="fr"):
             print(f"❌ Erreur de transcription: {transcript_status['error']}")
             return ""
         
-        print("⏳ Transcription en cours...")
-        time.sleep(5)
+        time.sleep(wait)
+        delay = min(delay * 2, 5)
 
 def transcribe_segment_openai(audio_file, language="fr"):
     """
@@ -494,12 +765,105 @@ def transcribe_segment(audio_file, language="fr"):
     if CONFIG["api_service"] == "local":
         return transcribe_segment_local(audio_file, language)
     elif CONFIG["api_service"] == "assemblyai":
-        return transcribe_segment_assemblyai(audio_file, language)
+        return _with_ssl_fix(transcribe_segment_assemblyai, audio_file, language)
     elif CONFIG["api_service"] == "openai":
-        return transcribe_segment_openai(audio_file, language)
+        return _with_ssl_fix(transcribe_segment_openai, audio_file, language)
     else:
         raise ValueError(f"Service de transcription non reconnu: {CONFIG['api_service']}")
 
+def _prefetch(iterable, maxsize=2):
+    """
+    Parcourt un itérable dans un thread séparé, avec quelques éléments d'avance
+    
+    Args:
+        iterable: Itérable à parcourir (ex: générateur de segments)
+        maxsize: Nombre maximal d'éléments préparés à l'avance
+    
+    Yields:
+        Les éléments de l'itérable, dans l'ordre
+    """
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    
+    def put(entry):
+        # Abandonner si le consommateur s'est arrêté
+        while not stop.is_set():
+            try:
+                items.put(entry, timeout=0.2)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    def produce():
+        try:
+            for item in iterable:
+                if not put(("item", item)):
+                    break
+            else:
+                put(("done", None))
+        except Exception as e:
+            put(("error", e))
+        finally:
+            # Libérer les ressources du générateur (ex: processus FFmpeg)
+            if hasattr(iterable, "close"):
+                iterable.close()
+    
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            yield value
+    finally:
+        stop.set()
+        producer.join()
+
+def transcribe_segments(segments, language="fr"):
+    """
+    Transcrit une suite de segments et renvoie les résultats dans l'ordre
+    
+    En local, plusieurs segments sont décodés ensemble par le modèle. Avec une
+    API externe, plusieurs segments sont envoyés simultanément pour que le
+    téléversement de l'un chevauche l'attente du résultat d'un autre.
+    
+    Args:
+        segments: Itérable de tuples (nom du segment, audio)
+        language: Code de langue (ex: fr, en)
+    
+    Yields:
+        Tuples (nom du segment, texte transcrit)
+    """
+    if CONFIG["api_service"] == "local":
+        # Regrouper parallel_jobs segments consécutifs par appel au modèle
+        segments = iter(segments)
+        while True:
+            batch = list(islice(segments, max(1, CONFIG["parallel_jobs"])))
+            if not batch:
+                return
+            
+            texts = transcribe_segments_local([segment for _, segment in batch], language)
+            yield from zip((segment_name for segment_name, _ in batch), texts)
+    
+    max_workers = CONFIG["parallel_jobs"] * 4
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for segment_name, segment in segments:
+            pending.append((segment_name, executor.submit(transcribe_segment, segment, language)))
+            
+            # Limiter le nombre de requêtes en cours
+            if len(pending) >= max_workers:
+                name, future = pending.popleft()
+                yield name, future.result()
+        
+        while pending:
+            name, future = pending.popleft()
+            yield name, future.result()
+
 def detect_file_encoding(file_path):
     """
     Détecte l'encodage d'un fichier existant
@@ -543,18 +907,15 @@ def sanitize_filename(filename):
         Nom de fichier nettoyé
     """
     # Remplacer les caractères problématiques
-    import unicodedata
-    import re
-    
     try:
         # Normaliser les caractères Unicode (décomposer les accents)
         filename = unicodedata.normalize('NFKD', filename)
         # Supprimer les caractères non-ASCII
-        filename = re.sub(r'[^\x00-\x7F]+', '_', filename)
+        filename = _NON_ASCII_RE.sub('_', filename)
         # Remplacer les caractères non alphanumériques par des underscores
-        filename = re.sub(r'[^\w\s.-]', '_', filename)
+        filename = _UNSAFE_CHARS_RE.sub('_', filename)
         # Remplacer les espaces par des underscores
-        filename = re.sub(r'\s+', '_', filename)
+        filename = _WHITESPACE_RE.sub('_', filename)
         return filename
     except Exception as e:
         print(f"⚠️ Erreur lors du nettoyage du nom de fichier: {e}")
@@ -576,20 +937,19 @@ def process_file(audio_file, language="fr", output_file=None):
     """
     start_time = time.time()
     
-    # Créer le dossier de sortie s'il n'existe pas
-    os.makedirs(CONFIG["output_folder"], exist_ok=True)
-    
     # Si aucun fichier de sortie n'est spécifié, en créer un
     if output_file is None:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         # Nettoyer le nom de fichier pour éviter les problèmes d'encodage
-        base_name = sanitize_filename(os.path.basename(audio_file).split('.')[0])
+        stem = os.path.splitext(os.path.basename(audio_file))[0]
+        base_name = sanitize_filename(stem)
         output_file = os.path.join(
             CONFIG["output_folder"],
             f"transcription_{base_name}_{timestamp}.txt"
         )
     
     # S'assurer que le fichier de sortie est dans un dossier existant
+    # (crée aussi le dossier de sortie par défaut)
     os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
     
     # Créer un fichier de journalisation
@@ -615,71 +975,57 @@ def process_file(audio_file, language="fr", output_file=None):
     try:
         # Diviser le fichier audio en segments
         print(f"✂️ Division du fichier en segments de {CONFIG['chunk_duration']} minutes...")
-        segments = split_audio(audio_file, CONFIG['chunk_duration'], CONFIG['temp_folder'])
+        total_duration = get_audio_duration(audio_file)
+        print(f"📊 Durée totale du fichier: {format_time(total_duration)} ({total_duration:.1f} secondes)")
+        num_segments = max(1, math.ceil(total_duration / (CONFIG['chunk_duration'] * 60)))
         
-        # Traiter chaque segment
-        all_text = ""
+        # Les segments sont produits pendant la transcription des précédents
+        uses_temp_files = CONFIG["api_service"] != "local"
+        if uses_temp_files:
+            # Les API ont besoin de fichiers à téléverser
+            segment_files = split_audio(audio_file, CONFIG['chunk_duration'], CONFIG['temp_folder'], total_duration)
+            segments = ((os.path.basename(f), f) for f in segment_files)
+        else:
+            # En local, l'audio décodé est transmis au modèle sans fichiers temporaires;
+            # le décodage et la VAD du segment suivant tournent dans un thread séparé
+            segments = _prefetch(stream_audio(audio_file, CONFIG['chunk_duration']))
         
-        for i, segment in enumerate(segments):
-            segment_name = os.path.basename(segment)
-            segment_progress = f"({i+1}/{len(segments)})"
-            
-            print(f"\n🔤 Transcription du segment {segment_progress}: {segment_name}")
-            
-            # Transcrire le segment
-            segment_text = transcribe_segment(segment, language)
-            
-            # Ajouter un séparateur pour indiquer le début d'un nouveau segment
-            if i > 0:
-                all_text += "\n\n--- Nouveau segment ---\n\n"
-            
-            all_text += segment_text
-            
-            # Enregistrer le texte transcrit dans le fichier de sortie
-            # (sauvegarde incrémentielle pour éviter la perte de données)
-            try:
-                with open(output_file, "a", encoding="utf-8") as f:
-                    if i == 0:
-                        f.write(segment_text)
-                    else:
-                        f.write("\n\n--- Nouveau segment ---\n\n" + segment_text)
-            except UnicodeEncodeError:
-                # Essayer avec un autre encodage si utf-8 échoue
-                with open(output_file, "a", encoding="latin-1") as f:
-                    if i == 0:
-                        f.write(segment_text)
-                    else:
-                        f.write("\n\n--- Nouveau segment ---\n\n" + segment_text)
-            
-            # Mettre à jour le fichier journal
-            try:
-                with open(log_file, "a", encoding="utf-8") as f:
-                    f.write(f"Segment {i+1}/{len(segments)} traité: {segment_name}\n")
-                    f.write(f"Heure: {datetime.now().strftime('%H:%M:%S')}\n\n")
-            except UnicodeEncodeError:
-                with open(log_file, "a", encoding="latin-1") as f:
-                    f.write(f"Segment {i+1}/{len(segments)} traité: {segment_name}\n")
-                    f.write(f"Heure: {datetime.now().strftime('%H:%M:%S')}\n\n")
-            
-            # Calculer et afficher la progression globale
-            progress = ((i + 1) / len(segments)) * 100
-            elapsed_time = time.time() - start_time
-            estimated_total = (elapsed_time / (i + 1)) * len(segments)
-            remaining_time = estimated_total - elapsed_time
-            
-            print(f"⏳ Progression: {progress:.1f}% - Temps écoulé: {format_time(elapsed_time)}")
-            print(f"⏱️ Temps restant estimé: {format_time(remaining_time)}")
+        # Traiter chaque segment
+        # Les fichiers de sortie et de journal sont ouverts une seule fois;
+        # la sortie est en binaire, chaque segment étant encodé en une fois
+        with open(output_file, "ab", buffering=1 << 16) as out, \
+             open(log_file, "a", encoding="utf-8", buffering=1 << 16) as log:
+            for i, (segment_name, segment_text) in enumerate(transcribe_segments(segments, language)):
+                segment_progress = f"({i+1}/{num_segments})"
+                
+                print(f"\n🔤 Segment transcrit {segment_progress}: {segment_name}")
+                
+                # Enregistrer le texte transcrit dans le fichier de sortie
+                # (sauvegarde incrémentielle pour éviter la perte de données),
+                # avec un séparateur pour indiquer le début d'un nouveau segment
+                if i > 0:
+                    segment_text = "\n\n--- Nouveau segment ---\n\n" + segment_text
+                out.write(segment_text.encode("utf-8"))
+                out.flush()
+                
+                # Mettre à jour le fichier journal
+                log.write(f"Segment {i+1}/{num_segments} traité: {segment_name}\n")
+                log.write(f"Heure: {datetime.now().strftime('%H:%M:%S')}\n\n")
+                log.flush()
+                
+                # Calculer et afficher la progression globale
+                progress = ((i + 1) / num_segments) * 100
+                elapsed_time = time.time() - start_time
+                estimated_total = (elapsed_time / (i + 1)) * num_segments
+                remaining_time = estimated_total - elapsed_time
+                
+                print(f"⏳ Progression: {progress:.1f}% - Temps écoulé: {format_time(elapsed_time)}")
+                print(f"⏱️ Temps restant estimé: {format_time(remaining_time)}")
         
         # Nettoyage des fichiers temporaires
-        print("\n🧹 Nettoyage des fichiers temporaires...")
-        for segment in segments:
-            if os.path.exists(segment):
-                os.remove(segment)
-        
-        try:
-            os.rmdir(CONFIG["temp_folder"])
-        except:
-            print(f"⚠️ Impossible de supprimer le dossier temporaire {CONFIG['temp_folder']}")
+        if uses_temp_files:
+            print("\n🧹 Nettoyage des fichiers temporaires...")
+            shutil.rmtree(CONFIG["temp_folder"], ignore_errors=True)
         
         # Finaliser le journal
         elapsed_time = time.time() - start_time
@@ -708,34 +1054,19 @@ def process_file(audio_file, language="fr", output_file=None):
         raise
 
 def fix_ssl_certificates_macos():
-    """Résout le problème de certificats SSL sur macOS"""
+    """
+    Résout le problème de certificats SSL sur macOS
+    
+    Returns:
+        True si une correction a été appliquée, False sinon
+    """
     import platform
-    import subprocess
+    import sys
     
     if platform.system() != "Darwin":  # Seulement sur macOS
-        return
-    
-    print("🔧 Vérification des certificats SSL sur macOS...")
-    
-    # Vérifier si les certificats Python existent déjà
-    import ssl
-    try:
-        ssl.get_default_verify_paths()
-        # Tester une connexion simple
-        import urllib.request
-        urllib.request.urlopen("https://www.google.com")
-        print("✅ Les certificats SSL semblent correctement configurés.")
-        return
-    except ssl.SSLError:
-        print("⚠️ Problème de certificats SSL détecté.")
-    except Exception as e:
-        if "CERTIFICATE_VERIFY_FAILED" in str(e):
-            print("⚠️ Problème de certificats SSL détecté.")
-        else:
-            print(f"⚠️ Autre problème de connexion détecté: {e}")
+        return False
     
     # Trouver l'emplacement du script Install Certificates.command
-    import sys
     python_dir = sys.exec_prefix
     cert_script = os.path.join(python_dir, "Install Certificates.command")
     
@@ -756,6 +1087,56 @@ def fix_ssl_certificates_macos():
         ssl._create_default_https_context = ssl._create_unverified_context
     
     print("🔄 Configuration SSL terminée.")
+    return True
+
+# La correction SSL n'est tentée qu'une fois, à la première erreur de certificat.
+# Résultat: None tant qu'elle n'a pas été tentée, puis True (appliquée) ou False
+_SSL_FIX_LOCK = threading.Lock()
+_ssl_fix_result = None
+
+def _is_certificate_error(error):
+    """
+    Indique si une exception (ou l'une de ses causes) est un échec de
+    vérification du certificat SSL
+    
+    Les autres erreurs SSL (connexion interrompue, échec de négociation...)
+    sont passagères et ne justifient pas de toucher aux certificats.
+    """
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, ssl.SSLCertVerificationError):
+            return True
+        if "CERTIFICATE_VERIFY_FAILED" in str(error):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+def _with_ssl_fix(func, *args, **kwargs):
+    """
+    Appelle func et, à la première erreur de certificat SSL, corrige les
+    certificats macOS puis réessaie une fois
+    
+    Aucune connexion de test n'est faite au démarrage: la correction n'a lieu
+    que si une requête HTTPS échoue réellement. Les appels qui échouent en
+    même temps (segments envoyés en parallèle) attendent la correction
+    appliquée par le premier, puis réessaient eux aussi.
+    """
+    global _ssl_fix_result
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        if not CONFIG["ssl_fix"] or not _is_certificate_error(e):
+            raise
+        
+        with _SSL_FIX_LOCK:
+            if _ssl_fix_result is None:
+                print(f"⚠️ Problème de certificats SSL détecté: {e}")
+                _ssl_fix_result = fix_ssl_certificates_macos()
+            if not _ssl_fix_result:
+                raise
+    
+    return func(*args, **kwargs)
 
 def main():
     """Fonction principale du script"""
@@ -766,6 +1147,8 @@ def main():
     parser.add_argument("-c", "--chunk", type=int, help="Durée des segments en minutes")
     parser.add_argument("-m", "--model", choices=["tiny", "base", "small", "medium", "large"], 
                         help="Modèle Whisper à utiliser (si mode local)")
+    parser.add_argument("--compute-type", choices=["auto", "int8", "int8_float16", "float16", "float32"],
+                        help="Précision des calculs du modèle local (float32 en dernier recours)")
     parser.add_argument("-s", "--service", choices=["local", "assemblyai", "openai"], 
                         help="Service de transcription à utiliser")
     parser.add_argument("--no-ssl-fix", action="store_true", 
@@ -790,6 +1173,9 @@ def main():
     if args.model:
         CONFIG["whisper_model"] = args.model
     
+    if args.compute_type:
+        CONFIG["compute_type"] = args.compute_type
+    
     if args.service:
         CONFIG["api_service"] = args.service
     
@@ -802,9 +1188,10 @@ def main():
     if args.max_speakers:
         CONFIG["max_speakers"] = args.max_speakers
     
-    # Résoudre les problèmes de certificats SSL sur macOS (sauf si --no-ssl-fix est utilisé)
-    if not args.no_ssl_fix:
-        fix_ssl_certificates_macos()
+    # Les problèmes de certificats SSL sur macOS sont corrigés à la première
+    # erreur rencontrée (sauf si --no-ssl-fix est utilisé)
+    if args.no_ssl_fix:
+        CONFIG["ssl_fix"] = False
     
     # Vérifier les dépendances
     if not check_dependencies():
@@ -816,6 +1203,14 @@ def main():
         if not os.path.exists(args.audio_file):
             print(f"❌ Le fichier audio '{args.audio_file}' n'existe pas.")
             return 1
+        
+        # Charger le modèle local en arrière-plan pendant la préparation de l'audio
+        if CONFIG["api_service"] == "local":
+            threading.Thread(
+                target=_warm_up_model,
+                args=(CONFIG["whisper_model"], args.language),
+                daemon=True
+            ).start()
             
         # Traiter le fichier
         process_file(args.audio_file, args.language, args.output)